@@ -37,14 +37,17 @@ async def start_mock_test(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error starting mock test: {str(e)}")
 
-@router.get("/topics", response_model=List[str])
+@router.get("/topics", response_model=List[schemas.TopicCount])
 async def get_available_topics(db: Session = Depends(get_db)):
     """
-    Get all available topics for filtering questions.
+    Get all available topics for filtering questions, with their question counts.
     """
     try:
         topics = crud.get_available_topics(db)
-        return topics
+        return [
+            schemas.TopicCount(topic=entry.topic, question_count=entry.question_count)
+            for entry in topics
+        ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting topics: {str(e)}")
 
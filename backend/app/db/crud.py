@@ -1,16 +1,48 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, text
+from sqlalchemy.dialects.postgresql import insert
 from app.db import models, schemas
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
 import random
 from app.services.llm_classifier import classifier
 
 def get_question_by_text(db: Session, question_text: str):
     return db.query(models.Question).filter(models.Question.question_text == question_text).first()
 
+def adjust_topic_counts(db: Session, deltas: Dict[str, int]):
+    """
+    Apply per-topic count changes to the topic catalog.
+    
+    Uses an atomic upsert so concurrent uploads never lose increments.
+    Rows are upserted in topic order so concurrent transactions always
+    lock catalog rows in the same order and cannot deadlock.
+    The caller is responsible for committing, so the catalog changes land
+    in the same transaction as the question changes they describe.
+    
+    Args:
+        db: Database session
+        deltas: Mapping of topic name to the change in its question count
+    """
+    rows = [
+        {"topic": topic, "question_count": delta}
+        for topic, delta in sorted(deltas.items())
+        if topic and delta
+    ]
+    if not rows:
+        return
+    
+    stmt = insert(models.TopicCatalog).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.TopicCatalog.topic],
+        set_={"question_count": models.TopicCatalog.question_count + stmt.excluded.question_count}
+    )
+    db.execute(stmt)
+
 def create_question(db: Session, question: schemas.QuestionCreate):
     db_question = models.Question(**question.dict())
     db.add(db_question)
+    adjust_topic_counts(db, {db_question.topic: 1})
     db.commit()
     db.refresh(db_question)
     return db_question
@@ -54,6 +86,7 @@ def create_questions_bulk(db: Session, questions: List[schemas.QuestionCreate]):
                 db.add(db_question)
                 created_questions.append(db_question)
     
+    adjust_topic_counts(db, Counter(q.topic for q in created_questions if q.topic))
     db.commit()
     
     for question in created_questions:
@@ -65,6 +98,59 @@ def create_questions_bulk(db: Session, questions: List[schemas.QuestionCreate]):
         "skipped_questions": skipped_questions
     }
 
+def update_question_topics(db: Session, updates: List[Tuple[int, str]]) -> int:
+    """
+    Write new topics for many questions with a single UPDATE ... FROM (VALUES ...).
+    
+    Rows whose topic is unchanged are left alone. The previous topics are
+    read with SELECT ... FOR UPDATE, so they are current even when another
+    writer touched the same rows, and the topic catalog is adjusted in the
+    same transaction.
+    
+    Args:
+        db: Database session
+        updates: List of (question_id, topic) pairs
+    
+    Returns:
+        Number of questions whose topic actually changed
+    """
+    if not updates:
+        return 0
+    
+    params = {}
+    values = []
+    id_params = []
+    for i, (question_id, topic) in enumerate(updates):
+        params[f"id_{i}"] = question_id
+        params[f"topic_{i}"] = topic
+        values.append(f"(CAST(:id_{i} AS INTEGER), CAST(:topic_{i} AS VARCHAR(100)))")
+        id_params.append(f":id_{i}")
+    
+    stmt = text(f"""
+        UPDATE questions AS q
+        SET topic = v.topic
+        FROM (VALUES {", ".join(values)}) AS v(id, topic)
+        JOIN (
+            SELECT id, topic FROM questions
+            WHERE id IN ({", ".join(id_params)})
+            ORDER BY id
+            FOR UPDATE
+        ) AS old ON old.id = v.id
+        WHERE q.id = v.id AND old.topic IS DISTINCT FROM v.topic
+        RETURNING old.topic AS old_topic, v.topic AS new_topic
+    """)
+    changed = db.execute(stmt, params).all()
+    
+    deltas = Counter()
+    for old_topic, new_topic in changed:
+        if old_topic:
+            deltas[old_topic] -= 1
+        deltas[new_topic] += 1
+    adjust_topic_counts(db, deltas)
+    db.commit()
+    
+    return len(changed)
+
 def get_random_questions(db: Session, limit: int = 10, topics: Optional[List[str]] = None):
     """
     Get random questions, optionally filtered by topics.
@@ -82,18 +168,25 @@ def get_random_questions(db: Session, limit: int = 10, topics: Optional[List[str
     if topics:
         query = query.filter(models.Question.topic.in_(topics))
     
-    all_questions = query.all()
-    if len(all_questions) <= limit:
-        return all_questions
-    return random.sample(all_questions, limit)
+    # Sample over IDs only, then load just the selected rows
+    question_ids = [row[0] for row in query.with_entities(models.Question.id).all()]
+    if len(question_ids) > limit:
+        question_ids = random.sample(question_ids, limit)
+    questions = db.query(models.Question).filter(models.Question.id.in_(question_ids)).all()
+    random.shuffle(questions)
+    return questions
 
 def get_question_by_id(db: Session, question_id: int):
     return db.query(models.Question).filter(models.Question.id == question_id).first()
 
-def get_available_topics(db: Session) -> List[str]:
-    """Get all available topics from the database."""
-    topics = db.query(models.Question.topic).filter(models.Question.topic.isnot(None)).distinct().all()
-    return [topic[0] for topic in topics if topic[0]]
+def get_available_topics(db: Session) -> List[models.TopicCatalog]:
+    """Get all topics that currently have questions, with their counts."""
+    return (
+        db.query(models.TopicCatalog)
+        .filter(models.TopicCatalog.question_count > 0)
+        .order_by(models.TopicCatalog.topic)
+        .all()
+    )
 
 def evaluate_answers(db: Session, answers: List[schemas.AnswerSubmission]):
     correct_count = 0
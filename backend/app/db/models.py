@@ -16,3 +16,9 @@ class Question(Base):
     correct_answer = Column(String(500))
     topic = Column(String(100), nullable=True)  # New topic field
     created_at = Column(DateTime, default=datetime.utcnow)
+
+class TopicCatalog(Base):
+    __tablename__ = "topic_catalog"
+    
+    topic = Column(String(100), primary_key=True)
+    question_count = Column(Integer, nullable=False, default=0)  # Kept in sync by crud on insert/reclassify
@@ -44,6 +44,10 @@ class MockTestQuestion(BaseModel):
 class MockTestResponse(BaseModel):
     questions: List[MockTestQuestion] = Field(..., min_items=1, description="List of questions for the mock test")
 
+class TopicCount(BaseModel):
+    topic: str = Field(..., description="The topic name")
+    question_count: int = Field(..., ge=0, description="Number of questions classified under this topic")
+
 class AnswerSubmission(BaseModel):
     question_id: int = Field(..., gt=0, description="ID of the question")
     selected_answer: str = Field(..., min_length=1, max_length=500, description="The selected answer")
@@ -0,0 +1,293 @@
+"""
+Backfill topic classification for existing questions.
+
+Reclassifies questions that have no topic, or that were left on the default
+topic (TOPICS[0]) because classification was unavailable or failed. Rows are
+read in ID order with keyset pagination in short transactions, classified in
+concurrent batches with the existing LLM classifier, and written back with
+bulk updates. Progress is checkpointed after every batch so an interrupted
+run can resume.
+
+Each batch is classified with exactly one rate-limited API request. Failed
+requests are retried through the same rate limiter; a batch that still fails
+is split into single-question requests. Questions that cannot be classified
+on their own are left unchanged and their IDs are recorded in the checkpoint,
+so one bad question never blocks the rows after it.
+
+Usage:
+    python -m app.scripts.reclassify_topics [--batch-size 10] [--workers 4]
+                                            [--max-requests-per-second 2]
+                                            [--max-retries 3]
+                                            [--only-missing] [--reset]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.db import crud, models
+from app.db.database import SessionLocal
+from app.services.llm_classifier import classifier
+
+DEFAULT_CHECKPOINT_FILE = "reclassify_checkpoint.json"
+
+# The batch classifier answers with a JSON array of topic names within
+# max_tokens=500, at roughly 20 tokens per topic. Larger batches get
+# truncated responses, which strict mode reports as failures.
+MAX_BATCH_SIZE = 20
+
+
+class RateLimiter:
+    """Spaces out calls across threads so at most `rate` happen per second."""
+    
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_allowed = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_allowed - now
+            self.next_allowed = max(now, self.next_allowed) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def load_checkpoint(path: str, only_missing: bool) -> Tuple[int, List[int]]:
+    """
+    Return the last question ID that was fully processed (or 0) and the IDs
+    of questions that could not be classified so far.
+    
+    Refuses to resume a checkpoint written with a different candidate filter,
+    since the rows it skipped would not match the current run.
+    """
+    if not os.path.exists(path):
+        return 0, []
+    with open(path) as f:
+        checkpoint = json.load(f)
+    
+    if checkpoint.get("only_missing", False) != only_missing:
+        raise RuntimeError(
+            f"Checkpoint {path} was written with only_missing={checkpoint.get('only_missing', False)}; "
+            "rerun with the same flags or pass --reset to start over."
+        )
+    return int(checkpoint.get("last_id", 0)), list(checkpoint.get("failed_ids", []))
+
+
+def save_checkpoint(path: str, last_id: int, only_missing: bool, failed_ids: List[int]):
+    """Atomically record the last question ID that was fully processed."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"last_id": last_id, "only_missing": only_missing, "failed_ids": failed_ids}, f)
+    os.replace(tmp_path, path)
+
+
+def classify_with_retries(rows: List[Tuple[int, str]], limiter: RateLimiter, max_retries: int) -> List[Optional[str]]:
+    """Classify rows in one strict request, retrying through the rate limiter."""
+    texts = [question_text for _, question_text in rows]
+    for attempt in range(max_retries + 1):
+        limiter.wait()
+        try:
+            return classifier.classify_questions_batch(texts, strict=True)
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            print(f"Classification failed for IDs {rows[0][0]}-{rows[-1][0]} ({str(e)}); retrying")
+            time.sleep(2 ** attempt)
+
+
+def classify_batch(
+    rows: List[Tuple[int, str]], limiter: RateLimiter, max_retries: int
+) -> Tuple[List[Tuple[int, str]], List[int]]:
+    """
+    Classify a batch of (id, question_text) rows into (id, topic) pairs.
+    
+    If the batch keeps failing it is split into single questions. Rows the
+    classifier could not place are left out so they stay unchanged, and
+    their IDs are returned alongside the updates.
+    """
+    try:
+        topics = classify_with_retries(rows, limiter, max_retries)
+    except Exception as e:
+        if len(rows) == 1:
+            print(f"Giving up on question ID {rows[0][0]}: {str(e)}")
+            return [], [rows[0][0]]
+        
+        print(f"Splitting batch IDs {rows[0][0]}-{rows[-1][0]} into single questions")
+        updates, failed_ids = [], []
+        for row in rows:
+            row_updates, row_failed_ids = classify_batch([row], limiter, max_retries)
+            updates.extend(row_updates)
+            failed_ids.extend(row_failed_ids)
+        return updates, failed_ids
+    
+    updates, failed_ids = [], []
+    for (question_id, _), topic in zip(rows, topics):
+        if topic:
+            updates.append((question_id, topic))
+        else:
+            print(f"Could not match a topic for question ID {question_id}")
+            failed_ids.append(question_id)
+    return updates, failed_ids
+
+
+def candidate_query(last_id: int, only_missing: bool):
+    """Build the ID-ordered query for questions that need reclassification."""
+    condition = models.Question.topic.is_(None)
+    if not only_missing:
+        condition = or_(condition, models.Question.topic == classifier.TOPICS[0])
+    
+    return (
+        select(models.Question.id, models.Question.question_text)
+        .where(models.Question.id > last_id, condition)
+        .order_by(models.Question.id)
+    )
+
+
+def iter_candidate_batches(
+    db: Session, last_id: int, only_missing: bool, batch_size: int
+) -> Iterator[List[Tuple[int, str]]]:
+    """
+    Yield batches of candidate rows using keyset pagination.
+    
+    Each page is read in its own short transaction so the backfill never
+    holds a snapshot open long enough to hold back vacuum on live tables.
+    """
+    while True:
+        rows = db.execute(candidate_query(last_id, only_missing).limit(batch_size)).all()
+        db.commit()
+        if not rows:
+            return
+        yield [(row.id, row.question_text) for row in rows]
+        last_id = rows[-1].id
+
+
+def run_backfill(
+    batch_size: int = 10,
+    workers: int = 4,
+    max_requests_per_second: Optional[float] = None,
+    max_retries: int = 3,
+    only_missing: bool = False,
+    checkpoint_file: str = DEFAULT_CHECKPOINT_FILE,
+) -> dict:
+    """
+    Reclassify existing questions and write their topics back.
+    
+    Args:
+        batch_size: Questions per classifier request and per bulk update (at most MAX_BATCH_SIZE)
+        workers: Number of classifier requests kept in flight
+        max_requests_per_second: Cap on classifier requests per second, retries included (None for no cap)
+        max_retries: Retries per request before a batch is split or a question is skipped
+        only_missing: Only reclassify questions without a topic
+        checkpoint_file: Path of the file used to resume interrupted runs
+    
+    Returns:
+        Summary with the number of questions processed, updated and failed
+    """
+    if not classifier.client:
+        raise RuntimeError("OPENAI_API_KEY is not set; refusing to backfill with the default topic.")
+    if not 1 <= batch_size <= MAX_BATCH_SIZE:
+        raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if max_retries < 0:
+        raise ValueError("max_retries must not be negative")
+    if max_requests_per_second is not None and max_requests_per_second <= 0:
+        raise ValueError("max_requests_per_second must be positive")
+    
+    last_id, failed_ids = load_checkpoint(checkpoint_file, only_missing)
+    limiter = RateLimiter(max_requests_per_second)
+    processed = 0
+    updated = 0
+    
+    print(f"Starting topic backfill after question ID {last_id}")
+    
+    db = SessionLocal()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Batches are written back in submission order so the checkpoint
+            # only ever covers IDs whose batches have been fully applied.
+            in_flight = deque()
+            
+            def drain_one():
+                nonlocal processed, updated
+                batch_last_id, batch_size_done, future = in_flight.popleft()
+                updates, batch_failed_ids = future.result()
+                updated += crud.update_question_topics(db, updates)
+                processed += batch_size_done
+                failed_ids.extend(batch_failed_ids)
+                save_checkpoint(checkpoint_file, batch_last_id, only_missing, failed_ids)
+                print(f"Processed {processed} questions ({updated} updated), last ID {batch_last_id}")
+            
+            try:
+                for rows in iter_candidate_batches(db, last_id, only_missing, batch_size):
+                    future = executor.submit(classify_batch, rows, limiter, max_retries)
+                    in_flight.append((rows[-1][0], len(rows), future))
+                    if len(in_flight) >= workers:
+                        drain_one()
+                
+                while in_flight:
+                    drain_one()
+            except BaseException:
+                # Also covers Ctrl-C: don't wait on queued classifier requests
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        db.close()
+    
+    print(f"Topic backfill complete: {processed} processed, {updated} updated, {len(failed_ids)} failed")
+    if failed_ids:
+        print(f"Questions left unchanged (see {checkpoint_file}): {failed_ids}")
+    return {"processed": processed, "updated": updated, "failed": len(failed_ids)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reclassify topics for existing questions.")
+    parser.add_argument("--batch-size", type=int, default=10,
+                        help=f"Questions per classifier request (max {MAX_BATCH_SIZE})")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent classifier requests")
+    parser.add_argument("--max-requests-per-second", type=float, default=None,
+                        help="Rate limit for classifier requests, retries included (default: unlimited)")
+    parser.add_argument("--max-retries", type=int, default=3,
+                        help="Retries per request before splitting a batch or skipping a question")
+    parser.add_argument("--only-missing", action="store_true",
+                        help="Only reclassify questions without a topic")
+    parser.add_argument("--checkpoint-file", default=DEFAULT_CHECKPOINT_FILE,
+                        help="File used to save and resume progress")
+    parser.add_argument("--reset", action="store_true", help="Ignore any saved checkpoint and start over")
+    args = parser.parse_args()
+    
+    if not 1 <= args.batch_size <= MAX_BATCH_SIZE:
+        parser.error(f"--batch-size must be between 1 and {MAX_BATCH_SIZE}")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_retries < 0:
+        parser.error("--max-retries must not be negative")
+    if args.max_requests_per_second is not None and args.max_requests_per_second <= 0:
+        parser.error("--max-requests-per-second must be positive")
+    
+    if args.reset and os.path.exists(args.checkpoint_file):
+        os.remove(args.checkpoint_file)
+    
+    run_backfill(
+        batch_size=args.batch_size,
+        workers=args.workers,
+        max_requests_per_second=args.max_requests_per_second,
+        max_retries=args.max_retries,
+        only_missing=args.only_missing,
+        checkpoint_file=args.checkpoint_file,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -74,25 +74,32 @@ class LLMClassifier:
             print(f"Error classifying question: {str(e)}")
             return self.TOPICS[0]  # Default fallback
     
-    def classify_questions_batch(self, questions: List[str]) -> List[Optional[str]]:
+    def classify_questions_batch(self, questions: List[str], strict: bool = False) -> List[Optional[str]]:
         """
         Classify multiple questions in a single API call for efficiency.
         
         Args:
             questions: List of question texts to classify
+            strict: If True, make exactly one API request with no client retries
+                and no per-question fallback. Errors are raised instead of being
+                replaced by the default topic, and unrecognised classifications
+                are returned as None.
             
         Returns:
             List of classified topics (same order as input)
         """
         if not self.client:
+            if strict:
+                raise RuntimeError("LLM client not available")
             print("LLM client not available. Using default classification.")
             return [self.TOPICS[0]] * len(questions)  # Default fallback for all questions
         
         try:
             # Create a batch prompt for multiple questions
             batch_prompt = self._build_batch_classification_prompt(questions)
+            client = self.client.with_options(max_retries=0) if strict else self.client
             
-            response = self.client.chat.completions.create(
+            response = client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are an expert in High Performance Computing (HPC) education. Your task is to classify HPC-related questions into specific modules."},
@@ -102,6 +109,9 @@ class LLMClassifier:
                 max_tokens=500
             )
             
+            if strict and response.choices[0].finish_reason == "length":
+                raise ValueError("Batch classification response was truncated; use a smaller batch")
+            
             result = response.choices[0].message.content.strip()
             
             # Parse the JSON response
@@ -122,16 +132,23 @@ class LLMClassifier:
                                     found_match = True
                                     break
                             if not found_match:
-                                validated_classifications.append(self.TOPICS[0])  # Default fallback
+                                # Default fallback (left unclassified in strict mode)
+                                validated_classifications.append(None if strict else self.TOPICS[0])
                     return validated_classifications
                 else:
+                    if strict:
+                        raise ValueError("Batch classification returned an unexpected number of topics")
                     # Fallback to individual classification
                     return [self.classify_question(q) for q in questions]
             except json.JSONDecodeError:
+                if strict:
+                    raise
                 # Fallback to individual classification
                 return [self.classify_question(q) for q in questions]
                 
         except Exception as e:
+            if strict:
+                raise
             print(f"Error in batch classification: {str(e)}")
             # Fallback to individual classification
             return [self.classify_question(q) for q in questions]
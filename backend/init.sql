@@ -16,6 +16,12 @@ CREATE TABLE IF NOT EXISTS questions (
 -- Create an index on question_text for faster lookups
 CREATE INDEX IF NOT EXISTS idx_questions_text ON questions(question_text);
 
+-- Create the topic catalog (per-topic question counts maintained by the API)
+CREATE TABLE IF NOT EXISTS topic_catalog (
+    topic VARCHAR(100) PRIMARY KEY,
+    question_count INTEGER NOT NULL DEFAULT 0
+);
+
 -- Insert some sample questions if the table is empty
 INSERT INTO questions (question_text, option_a, option_b, option_c, option_d, correct_answer)
 SELECT 
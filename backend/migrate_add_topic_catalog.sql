@@ -0,0 +1,22 @@
+-- Migration to add the topic_catalog table
+-- The catalog keeps a per-topic question count so the topic list can be served
+-- without scanning the questions table. The application updates the counts
+-- incrementally whenever questions are inserted or reclassified.
+
+CREATE TABLE IF NOT EXISTS topic_catalog (
+    topic VARCHAR(100) PRIMARY KEY,
+    question_count INTEGER NOT NULL DEFAULT 0
+);
+
+-- Seed (or resync) the catalog from the questions that already exist
+INSERT INTO topic_catalog (topic, question_count)
+SELECT topic, COUNT(*)
+FROM questions
+WHERE topic IS NOT NULL
+GROUP BY topic
+ON CONFLICT (topic) DO UPDATE SET question_count = EXCLUDED.question_count;
+
+-- Drop counts for topics that no longer have any questions
+UPDATE topic_catalog
+SET question_count = 0
+WHERE topic NOT IN (SELECT DISTINCT topic FROM questions WHERE topic IS NOT NULL);
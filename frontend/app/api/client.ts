@@ -35,6 +35,11 @@ export interface UploadResult {
   skipped_questions?: string[];
 }
 
+export interface TopicCount {
+  topic: string;
+  question_count: number;
+}
+
 export interface AnswerSubmission {
   question_id: number;
   selected_answer: string;
@@ -63,7 +68,7 @@ export const mockTestAPI = {
     return apiClient.get(`/api/mocktest/start?${params.toString()}`);
   },
   
-  getTopics: (): Promise<AxiosResponse<string[]>> =>
+  getTopics: (): Promise<AxiosResponse<TopicCount[]>> =>
     apiClient.get('/api/mocktest/topics'),
   
   submitTest: (answers: AnswerSubmission[]): Promise<AxiosResponse<TestResult>> =>
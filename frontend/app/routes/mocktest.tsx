@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link, useLocation } from 'react-router';
-import { mockTestAPI, type Question, type TestResult, type AnswerSubmission } from '../api/client';
+import { mockTestAPI, type Question, type TestResult, type AnswerSubmission, type TopicCount } from '../api/client';
 
 // Utility function to detect and format code snippets
 const formatQuestionText = (text: string) => {
@@ -99,7 +99,7 @@ export default function MockTest() {
   const [testSubmitted, setTestSubmitted] = useState(false);
   const [result, setResult] = useState<TestResult | null>(null);
   const [error, setError] = useState<string | null>(null);
-  const [availableTopics, setAvailableTopics] = useState<string[]>([]);
+  const [availableTopics, setAvailableTopics] = useState<TopicCount[]>([]);
   const [selectedTopics, setSelectedTopics] = useState<string[]>([]);
   const [showTopicFilter, setShowTopicFilter] = useState(false);
 
@@ -152,7 +152,7 @@ export default function MockTest() {
   };
 
   const handleSelectAllTopics = () => {
-    setSelectedTopics(availableTopics);
+    setSelectedTopics(availableTopics.map(({ topic }) => topic));
   };
 
   const handleClearTopics = () => {
@@ -312,14 +312,14 @@ export default function MockTest() {
                     </div>
                     
                     <div className="topic-checkboxes">
-                      {availableTopics.map((topic) => (
+                      {availableTopics.map(({ topic, question_count }) => (
                         <label key={topic} className="topic-checkbox">
                           <input
                             type="checkbox"
                             checked={selectedTopics.includes(topic)}
                             onChange={() => handleTopicToggle(topic)}
                           />
-                          <span className="checkbox-label">{topic}</span>
+                          <span className="checkbox-label">{topic} ({question_count})</span>
                         </label>
                       ))}
                     </div>